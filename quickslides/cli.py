@@ -51,8 +51,7 @@ def main(markdown_file: str, output: str | None, compile: bool) -> int:
         output_path = Path(output)
 
     # Read markdown content
-    with open(md_path, encoding="utf-8") as file:
-        content = file.read()
+    content = md_path.read_text(encoding="utf-8")
 
     # Process the content with a progress indicator
     with Progress(
@@ -133,7 +132,8 @@ def main(markdown_file: str, output: str | None, compile: bool) -> int:
                         str(pdf_output_path),
                     ],
                     check=True,
-                    capture_output=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
                     text=True,
                     cwd=tmp_dir,
                 )
@@ -1,30 +1,48 @@
 """Markdown to Typst conversion utilities."""
 
 import re
+from collections.abc import Callable
+from functools import lru_cache
 from typing import Any
 
 import mistune
 
+_FRONT_MATTER_RE = re.compile(r"^---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+_TITLE_RE = re.compile(r"^(#+)\s+(.*?)$")
+_SLIDE_SPLIT_RE = re.compile(r"^(?=##? )", re.MULTILINE)
+_EXTRA_NEWLINES_RE = re.compile(r"\n{2,}")
+_INDENT_RE = re.compile(r"^(?=.)", re.MULTILINE)
+_MATH_RE = re.compile(r"(\$\$.*?\$\$|\$.*?\$)", re.DOTALL)
+
+# Characters that need escaping in Typst (square brackets, braces, and other special chars)
+_TYPST_ESCAPES = str.maketrans({char: f"\\{char}" for char in '#\\{}$[]_*"`'})
+
+# Typst heading markers for markdown heading levels 1 to 6
+_HEADING_PREFIXES = tuple("=" * level for level in range(1, 7))
+
+# Markdown parser producing an AST, shared across all conversions
+_MARKDOWN_PARSER = mistune.create_markdown(renderer=None)
+
 
 def remove_trailing_whitespaces(text: str) -> str:
     """
     Remove trailing whitespaces from each line in the text.
     """
-    return "\n".join(map(lambda x: x.rstrip(), text.splitlines()))
+    return "\n".join(map(str.rstrip, text.splitlines()))
 
 
 def remove_extra_newlines(text: str) -> str:
     """
     Remove extra newlines from the text.
     """
-    return re.sub(r"\n{2,}", "\n", text)
+    return _EXTRA_NEWLINES_RE.sub("\n", text)
 
 
+@lru_cache(maxsize=512)
 def convert_text(text: str) -> str:
     """Convert markdown text to typst using mistune parser."""
     # Parse markdown to AST
-    markdown = mistune.create_markdown(renderer=None)
-    ast = markdown(text)
+    ast = _MARKDOWN_PARSER(text)
     if isinstance(ast, str):
         return ast
 
@@ -34,110 +52,102 @@ def convert_text(text: str) -> str:
 
 def convert_ast_to_typst(tokens: list[dict[str, Any]]) -> str:
     """Convert markdown AST to typst markup."""
-    result = []
-    for token in tokens:
-        result.append(convert_token(token))
-    return "".join(result).strip()
+    return "".join(map(convert_token, tokens)).strip()
 
 
 def escape_typst_chars(text: str) -> str:
     """Escape characters that have special meaning in Typst."""
-    # List of characters that need escaping in Typst (square brackets, braces, and other special chars)
-    special_chars = r'#\\{}$[]_*"`'
-
-    # Create a regex pattern that matches any special character
-    pattern = re.compile(f"([{re.escape(special_chars)}])")
-
     # First, protect math expressions:
     # Find all math expressions (both inline $...$ and display $$...$$)
-    math_pattern = re.compile(r"(\$\$.*?\$\$|\$.*?\$)", re.DOTALL)
     parts = []
     last_end = 0
 
-    for match in math_pattern.finditer(text):
+    for match in _MATH_RE.finditer(text):
         # Add escaped text before math
-        parts.append(pattern.sub(r"\\\1", text[last_end : match.start()]))
+        parts.append(text[last_end : match.start()].translate(_TYPST_ESCAPES))
         # Add unmodified math expression
         parts.append(match.group(0))
         last_end = match.end()
 
     # Add remaining text (escaped)
     if last_end < len(text):
-        parts.append(pattern.sub(r"\\\1", text[last_end:]))
+        parts.append(text[last_end:].translate(_TYPST_ESCAPES))
 
     return "".join(parts)
 
 
-def convert_token(token: dict[str, Any]) -> str:
-    """Convert a single AST token to typst markup."""
-    token_type = token["type"]
-
-    # dict mapping token types to handler functions
-    token_handlers = {
-        "paragraph": lambda t: convert_ast_to_typst(t["children"]) + "\n\n",
-        "text": lambda t: escape_typst_chars(t["raw"]) + " ",
-        "emphasis": lambda t: f"_{convert_ast_to_typst(t['children'])}_" + " ",
-        "strong": lambda t: f"*{convert_ast_to_typst(t['children'])}*" + " ",
-        "link": lambda t: f'#link("{t["attrs"]["url"]}")[{escape_typst_chars(convert_ast_to_typst(t["children"]))}]',
-        "image": lambda t: (
-            f'#figure(#image("{t["attrs"]["url"]}"), caption: "{escape_typst_chars(t.get("alt", ""))}") '
-            if t.get("alt", "")
-            else f'#image("{t["attrs"]["url"]}") '
-        ),
-        "codespan": lambda t: f"`{t['raw']}` ",
-        "code": lambda t: f"```{t.get('lang', '')}\n{t['text']}\n```",
-        "block_text": lambda t: convert_ast_to_typst(t["children"]),
-        "block_quote": lambda t: f"#quote[{convert_ast_to_typst(t['children'])}] ",
-        "list": lambda t: _handle_list(t),
-        "heading": lambda t: f"={'=' * (t['attrs']['level'] - 1)} {convert_ast_to_typst(t['children'])}\n\n",
-        "thematic_break": lambda t: "#line(length: 100%)\n\n",
-        "table": lambda t: _handle_table(t),
-    }
-
-    def _handle_list(t: dict[str, Any]) -> str:
-        """Handle list conversion helper."""
-        return (
-            "".join(
-                [
-                    f"{'\n' + '  ' * t['attrs'].get('depth', 0)}{'+' if t['attrs'].get('ordered', False) else '-'} "
-                    f"{convert_ast_to_typst(item['children'])}"
-                    for item in t["children"]
-                ]
-            )
-            + "\n\n"
+def _handle_list(token: dict[str, Any]) -> str:
+    """Handle list conversion helper."""
+    return (
+        "".join(
+            [
+                f"{'\n' + '  ' * token['attrs'].get('depth', 0)}{'+' if token['attrs'].get('ordered', False) else '-'} "
+                f"{convert_ast_to_typst(item['children'])}"
+                for item in token["children"]
+            ]
         )
+        + "\n\n"
+    )
+
+
+def _handle_table(token: dict[str, Any]) -> str:
+    """Handle table conversion helper."""
+    headers = token.get("header", [])
+    rows = token.get("rows", [])
+    num_cols = len(headers) if headers else (len(rows[0]) if rows else 2)
+
+    parts = [f"#table(columns: {num_cols})"]
+    if headers:
+        parts.append("[")
+        parts.extend(f"[*{convert_ast_to_typst(header)}*]" for header in headers)
 
-    def _handle_table(t: dict[str, Any]) -> str:
-        """Handle table conversion helper."""
-        headers = t.get("header", [])
-        rows = t.get("rows", [])
-        num_cols = len(headers) if headers else (len(rows[0]) if rows else 2)
+    for row in rows:
+        parts.extend(f"[{convert_ast_to_typst(cell)}]" for cell in row)
 
-        result = f"#table(columns: {num_cols})"
-        if headers:
-            result += "["
-            for header in headers:
-                result += f"[*{convert_ast_to_typst(header)}*]"
+    return "".join(parts)
+
+
+def _handle_default(token: dict[str, Any]) -> str:
+    """Process children of tokens without a dedicated handler, if any."""
+    if "children" in token:
+        return convert_ast_to_typst(token["children"])
+    else:
+        return ""
 
-        for row in rows:
-            for cell in row:
-                result += f"[{convert_ast_to_typst(cell)}]"
 
-        return result
+# dict mapping token types to handler functions
+_TOKEN_HANDLERS: dict[str, Callable[[dict[str, Any]], str]] = {
+    "paragraph": lambda t: convert_ast_to_typst(t["children"]) + "\n\n",
+    "text": lambda t: escape_typst_chars(t["raw"]) + " ",
+    "emphasis": lambda t: f"_{convert_ast_to_typst(t['children'])}_" + " ",
+    "strong": lambda t: f"*{convert_ast_to_typst(t['children'])}*" + " ",
+    "link": lambda t: f'#link("{t["attrs"]["url"]}")[{escape_typst_chars(convert_ast_to_typst(t["children"]))}]',
+    "image": lambda t: (
+        f'#figure(#image("{t["attrs"]["url"]}"), caption: "{escape_typst_chars(t.get("alt", ""))}") '
+        if t.get("alt", "")
+        else f'#image("{t["attrs"]["url"]}") '
+    ),
+    "codespan": lambda t: f"`{t['raw']}` ",
+    "code": lambda t: f"```{t.get('lang', '')}\n{t['text']}\n```",
+    "block_text": lambda t: convert_ast_to_typst(t["children"]),
+    "block_quote": lambda t: f"#quote[{convert_ast_to_typst(t['children'])}] ",
+    "list": _handle_list,
+    "heading": lambda t: f"{_HEADING_PREFIXES[t['attrs']['level'] - 1]} {convert_ast_to_typst(t['children'])}\n\n",
+    "thematic_break": lambda t: "#line(length: 100%)\n\n",
+    "table": _handle_table,
+}
 
-    def _handle_default(t: dict[str, Any]) -> str:
-        if "children" in token:
-            return convert_ast_to_typst(token["children"])
-        else:
-            return ""
 
+def convert_token(token: dict[str, Any]) -> str:
+    """Convert a single AST token to typst markup."""
     # Use the handler from the dictionary, or otherwise process children if available
-    return token_handlers.get(token_type, _handle_default)(token)
+    return _TOKEN_HANDLERS.get(token["type"], _handle_default)(token)
 
 
 def indent_lines(text: str, indent: str = "  ") -> str:
     """Indent lines of text with the specified indent."""
-    return "\n".join(f"{indent}{line}" if line else line for line in text.splitlines())
+    # Escape backslashes so the indent is inserted literally by re.sub
+    return _INDENT_RE.sub(indent.replace("\\", r"\\"), text)
 
 
 def convert_markdown_to_typst(
@@ -154,7 +164,7 @@ def convert_markdown_to_typst(
     """
     # Parse front matter if present
     front_matter: dict[str, str] = {}
-    front_matter_match = re.match(r"^---\s*\n(.*?)\n---\s*\n", markdown_content, re.DOTALL)
+    front_matter_match = _FRONT_MATTER_RE.match(markdown_content)
 
     if front_matter_match:
         front_matter_content = front_matter_match.group(1)
@@ -255,38 +265,11 @@ def process_slides(markdown_content: str) -> list[str]:
     Returns:
         List of typst slides
     """
-    # Regex patterns for headings
-    h1_pattern = r"^#\s+"
-    h2_pattern = r"^##\s+"
-    h1_re = re.compile(h1_pattern)
-    h2_re = re.compile(h2_pattern)
-
-    # Split content into slides
-    lines = markdown_content.split("\n")
-    slides: list[list[str]] = []
-    current_slide: list[str] = []
-
-    for line in lines:
-        # Check if this is a heading that starts a new slide
-        if h1_re.match(line) or h2_re.match(line):
-            if current_slide:
-                slides.append(current_slide)
-                current_slide = []
-        current_slide.append(line)
-
-    # Add the last slide if there's content
-    if current_slide:
-        slides.append(current_slide)
+    # Split content into slides, each starting at an H1 or H2 heading
+    slides = [slide for slide in _SLIDE_SPLIT_RE.split(markdown_content) if slide.strip()]
 
     # Convert each slide to typst
-    typst_slides: list[str] = []
-
-    for slide_lines in slides:
-        slide_content = "\n".join(slide_lines)
-        typst_slide = convert_slide(slide_content)
-        typst_slides.append(typst_slide)
-
-    return typst_slides
+    return [convert_slide(slide_content) for slide_content in slides]
 
 
 def convert_slide(slide_content: str) -> str:
@@ -299,15 +282,11 @@ def convert_slide(slide_content: str) -> str:
     Returns:
         The typst representation of the slide
     """
-    # Check if slide starts with a heading
-    lines = slide_content.splitlines()
-    if not lines:
-        return ""
-
-    first_line = lines[0]
+    # Check if slide starts with a heading, keeping the rest as the body
+    first_line, _, body_content = slide_content.partition("\n")
 
     # Get slide title and remove the heading marker
-    title_match = re.match(r"^(#+)\s+(.*?)$", first_line)
+    title_match = _TITLE_RE.match(first_line.rstrip("\r"))
     if not title_match:
         # No heading, convert as regular content
         return convert_text(slide_content)
@@ -315,9 +294,6 @@ def convert_slide(slide_content: str) -> str:
     heading_level = len(title_match.group(1))
     slide_title = title_match.group(2)
 
-    # Remove the title line from content
-    body_content = "\n".join(lines[1:])
-
     # Convert the body content
     typst_body = convert_text(body_content)
     typst_body = indent_lines(typst_body)
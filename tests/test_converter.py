@@ -1,6 +1,12 @@
 """Tests for markdown to typst conversion."""
 
-from quickslides.converter import convert_markdown_to_typst, convert_text
+from quickslides.converter import (
+    convert_markdown_to_typst,
+    convert_text,
+    escape_typst_chars,
+    indent_lines,
+    process_slides,
+)
 
 
 def test_convert_bold_text() -> None:
@@ -80,3 +86,26 @@ This is a test presentation.
     assert "- Bullet point" in result
     assert "*Bold text*" in result
     assert "_italic text_" in result
+
+
+def test_process_slides_splits_on_h1_and_h2() -> None:
+    """Test that slides start at H1 and H2 headings only."""
+    markdown = "Intro text\n\n# Section\n\n## First\n\n### Sub\n\nBody\n\n## Second\n"
+    intro, section, first, second = process_slides(markdown)
+
+    assert intro == "Intro text"
+    assert section == "#section[Section]"
+    assert first.startswith('#slide(title: "First")')
+    assert "= Sub" in first
+    assert second.startswith('#slide(title: "Second")')
+
+
+def test_escape_typst_chars_preserves_math() -> None:
+    """Test that special characters are escaped outside math expressions only."""
+    assert escape_typst_chars("a_b #c [d]") == r"a\_b \#c \[d\]"
+    assert escape_typst_chars("x_1 $x_1$ $$y*z$$") == r"x\_1 $x_1$ $$y*z$$"
+
+
+def test_indent_lines_skips_empty_lines() -> None:
+    """Test that only non-empty lines are indented."""
+    assert indent_lines("a\n\nb") == "  a\n\n  b"